@@ -5,26 +5,18 @@ Handles authentication, DID resolution, and post retrieval from Bluesky
 accounts using the atproto SDK.
 """
 
-from atproto import IdResolver, Client
+from atproto import IdResolver, Client, Request, exceptions
+import httpx
 import os
+import time
 import logging
 
-# ── Logging Setup ──────────────────────────────────────────────────────────────
-
-# Ensure the log directory exists
-log_directory = 'log'
-if not os.path.exists(log_directory):
-    os.makedirs(log_directory)
-
-# Set up logging to a file in the log directory
-logging.basicConfig(
-    filename=os.path.join(log_directory, 'general.log'), 
-    level=logging.DEBUG,
-    format='%(asctime)s - %(levelname)s - %(message)s'
-)
-
 # ── Authentication ─────────────────────────────────────────────────────────────
 
+# Connection pool for each Client's HTTP session. Paginated fetches run back to
+# back, so a longer keep-alive lets every page reuse the same TLS connection.
+HTTP_LIMITS = httpx.Limits(max_keepalive_connections=32, max_connections=64, keepalive_expiry=30.0)
+
 def login(handle_env_var, app_pass_env_var):
     """Login to Bluesky account using environment variables."""
     try:
@@ -32,7 +24,7 @@ def login(handle_env_var, app_pass_env_var):
         app_pass = os.getenv(app_pass_env_var)
         host_url = os.getenv("BSKY_HOST_URL", "https://bsky.social")
 
-        client = Client(host_url)
+        client = Client(host_url, request=Request(limits=HTTP_LIMITS))
 
         if not handle or not app_pass:
             logging.error("Handle or app password missing in environment variables.")
@@ -50,18 +42,49 @@ def login(handle_env_var, app_pass_env_var):
 
 # ── DID Resolution ─────────────────────────────────────────────────────────────
 
+# Shared so handle and DID lookups reuse the resolver's HTTP connections
+_RESOLVER = IdResolver()
+
+# Resolved packages keyed by handle, as (resolved_at, package) tuples.
+# Handles rarely move, so a day-old answer is still good enough.
+DID_CACHE_TTL = 24 * 60 * 60  # Seconds
+DID_CACHE_SIZE = 1024
+_did_cache = {}
+
+def _resolve_cached(handle):
+    """Resolve a handle to its DID and DID document, reusing fresh results."""
+    now = time.monotonic()
+    cached = _did_cache.get(handle)
+    if cached and now - cached[0] < DID_CACHE_TTL:
+        logging.debug("Using cached DID for handle: %s", handle)
+        return cached[1]
+
+    logging.debug("Resolving DID for handle: %s", handle)
+    did = _RESOLVER.handle.resolve(handle)
+    logging.debug("Resolved DID: %s", did)
+
+    did_doc = _RESOLVER.did.resolve(did)
+    logging.debug("Resolved DID Document: %s", did_doc)
+
+    package = {"did": did, "did_doc": did_doc}
+
+    # resolve() returns None rather than raising when there is no document;
+    # don't pin that answer for a whole TTL
+    if did_doc is None:
+        return package
+
+    # Drop the oldest entry once full; dicts keep insertion order
+    _did_cache.pop(handle, None)
+    if len(_did_cache) >= DID_CACHE_SIZE:
+        del _did_cache[next(iter(_did_cache))]
+    _did_cache[handle] = (now, package)
+
+    return package
+
 def DID_resolve(handle):
     """Resolve DID (Decentralized Identifier) for a given handle."""
     try:
-        logging.debug("Resolving DID for handle: %s", handle)
-        resolver = IdResolver()
-        did = resolver.handle.resolve(handle)
-        logging.debug("Resolved DID: %s", did)
-
-        did_doc = resolver.did.resolve(did)
-        logging.debug("Resolved DID Document: %s", did_doc)
-
-        package = {"did": did, "did_doc": did_doc}
+        package = _resolve_cached(handle)
         logging.info("Successfully resolved DID and DID Document.")
 
         return package
@@ -72,45 +95,83 @@ def DID_resolve(handle):
 
 # ── Post Retrieval ─────────────────────────────────────────────────────────────
 
+# Transient failures (5xx, timeouts, 429) are retried with exponential backoff
+# instead of ending pagination early. Other errors, like a 404 for an unknown
+# DID, won't go away on retry and are raised straight away.
+FETCH_RETRIES = 3
+FETCH_BACKOFF = 2.0          # Seconds before the first retry, doubled each time
+FETCH_MAX_RATE_WAIT = 300.0  # Give up rather than block longer on a rate limit
+
+def _is_transient(error):
+    """Whether a failed page fetch is worth retrying."""
+    # No response means the request never completed (connection error, timeout)
+    response = error.response
+    return response is None or response.status_code >= 500 or response.status_code == 429
+
+def _retry_delay(error, attempt):
+    """Work out how long to wait before retrying a failed page fetch."""
+    if isinstance(error, exceptions.RateLimitExceededError):
+        if error.retry_after is not None:
+            return error.retry_after
+        if error.reset_at is not None:
+            return max(0.0, error.reset_at.timestamp() - time.time())
+    return FETCH_BACKOFF * (2 ** attempt)
+
+def _fetch_page(client, client_did, limit, cursor):
+    """Fetch one page of post records, retrying transient errors."""
+    for attempt in range(FETCH_RETRIES + 1):
+        try:
+            return client.app.bsky.feed.post.list(client_did, limit=limit, cursor=cursor)
+        except (exceptions.NetworkError, exceptions.RequestException) as e:
+            if attempt == FETCH_RETRIES or not _is_transient(e):
+                raise
+            delay = _retry_delay(e, attempt)
+            if delay > FETCH_MAX_RATE_WAIT:
+                raise
+            logging.warning("Fetching posts failed (%s), retrying in %.0f seconds", e, delay)
+            time.sleep(delay)
+
 def retrieve_posts(client, client_did, limit=100):
-    """Retrieve posts from a Bluesky account with pagination."""
-    post_list = []
+    """
+    Retrieve posts from a Bluesky account with pagination.
+
+    Yields post records one at a time, fetching the next page only when the
+    caller has consumed the current one, so stopping early skips the rest
+    of the account.
+    """
+    total = 0
     has_more = True
     cursor = None
 
-    logging.info(f"Starting to retrieve posts for client ID: {client_did}")
-
-    while has_more:
-        try:
-            # Use cursor for pagination
-            if cursor:
-                data = client.app.bsky.feed.post.list(client_did, limit=limit, cursor=cursor)
-            else:
-                data = client.app.bsky.feed.post.list(client_did, limit=limit)
-
-            logging.debug(f"Fetched data with cursor: {cursor}")
-
-            # Check for the correct attribute containing the posts
-            if not hasattr(data, 'records') or not data.records:
-                logging.info("No more posts found or 'records' attribute is missing.")
-                break
+    logging.info("Starting to retrieve posts for client ID: %s", client_did)
 
-            # Fetch posts from the 'records' attribute
-            posts = data.records
+    # finally, so the total is still logged when the caller stops early and
+    # the generator is closed at a yield
+    try:
+        while has_more:
+            try:
+                # Use cursor for pagination
+                data = _fetch_page(client, client_did, limit, cursor)
 
-            # Add the posts to the post_list
-            post_list.extend(posts.values())
+                logging.debug("Fetched data with cursor: %s", cursor)
 
-            logging.info(f"Retrieved {len(posts)} posts.")
+                # Fetch posts from the 'records' attribute
+                posts = getattr(data, 'records', None)
+                if not posts:
+                    logging.info("No more posts found or 'records' attribute is missing.")
+                    break
 
-            # Get the next cursor for pagination
-            cursor = data.cursor
-            has_more = bool(cursor)
+                logging.info("Retrieved %d posts.", len(posts))
 
-        except Exception as e:
-            logging.error(f"Error fetching posts: {e}")
-            break
+                # Get the next cursor for pagination
+                cursor = data.cursor
+                has_more = bool(cursor)
 
-    logging.info(f"Completed retrieval of posts for client ID: {client_did}. Total posts retrieved: {len(post_list)}")
+            except Exception as e:
+                logging.error("Error fetching posts: %s", e)
+                break
 
-    return post_list
+            total += len(posts)
+            yield from posts.values()
+    finally:
+        logging.info("Completed retrieval of posts for client ID: %s. Total posts retrieved: %d", client_did, total)
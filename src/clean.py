@@ -8,52 +8,44 @@ from Bluesky posts before they're used as context for generation.
 from html import unescape
 import re
 import logging
-import os
 
-# ── Logging Setup ──────────────────────────────────────────────────────────────
+# ── Patterns ───────────────────────────────────────────────────────────────────
 
-# Ensure the log directory exists
-log_directory = 'log'
-if not os.path.exists(log_directory):
-    os.makedirs(log_directory)
+# Compiled once at import; clean_content runs for every fetched post.
+_HTML_TAG_RE = re.compile(r'<[^<]+?>')
 
-# Set up logging to a file in the log directory
-logging.basicConfig(
-    filename=os.path.join(log_directory, 'general.log'), 
-    level=logging.DEBUG,
-    format='%(asctime)s - %(levelname)s - %(message)s'
+# Usernames and special characters, removed in a single pass. The handle
+# branch must be tried first, before the single-character branch would eat
+# its '@' prefix.
+_STRIP_RE = re.compile(
+    r'@\w+\.(?:[a-zA-Z0-9](?:[a-zA-Z0-9-]{0,61}[a-zA-Z0-9])?\.)+[a-zA-Z](?:[a-zA-Z0-9-]{0,61}[a-zA-Z0-9])?'
+    r'|[^\w\s.,!?;:]'
 )
 
+# Emoji shortcodes. Removed in a second pass, once special characters are
+# gone, since which colons pair up depends on what sat between them.
+_EMOJI_RE = re.compile(r':\w+:')
+
 # ── Content Cleaning ───────────────────────────────────────────────────────────
 
 def clean_content(content):
     """Clean and preprocess content from Bluesky posts."""
-    logging.debug("Original content: %s", content)
-
-    # Remove HTML tags
-    cleaned_content = re.sub('<[^<]+?>', '', content)
-    logging.debug("After removing HTML tags: %s", cleaned_content)
-
-    # Decode HTML entities
-    cleaned_content = unescape(cleaned_content)
-    logging.debug("After decoding HTML entities: %s", cleaned_content)
-
-    # Remove usernames based on domain patterns
-    domain_regex = r'@\w+\.([a-zA-Z0-9]([a-zA-Z0-9-]{0,61}[a-zA-Z0-9])?\.)+[a-zA-Z]([a-zA-Z0-9-]{0,61}[a-zA-Z0-9])?'
-    cleaned_content = re.sub(domain_regex, '', cleaned_content)
-    logging.debug("After removing usernames: %s", cleaned_content)
+    # Nothing to clean; skip the regex passes entirely
+    if not content or content.isspace():
+        return ""
 
-    # Remove special characters but keep basic punctuation
-    cleaned_content = re.sub(r'[^\w\s.,!?;:]', '', cleaned_content)
-    logging.debug("After removing special characters: %s", cleaned_content)
+    # Tags have to go before entities are decoded, or "&lt;b&gt;" would be
+    # stripped as if it were markup
+    cleaned_content = unescape(_HTML_TAG_RE.sub('', content))
 
-    # Remove words enclosed with colons (emoji shortcodes)
-    cleaned_content = re.sub(r':\w+:', '', cleaned_content)
-    logging.debug("After removing words enclosed with colons: %s", cleaned_content)
+    # Remove usernames and special characters, then emoji shortcodes
+    cleaned_content = _EMOJI_RE.sub('', _STRIP_RE.sub('', cleaned_content))
 
     # Remove extra whitespace
     cleaned_content = ' '.join(cleaned_content.split())
-    logging.debug("Final cleaned content: %s", cleaned_content)
+
+    if logging.getLogger().isEnabledFor(logging.DEBUG):
+        logging.debug("Cleaned content: %r -> %r", content, cleaned_content)
 
     return cleaned_content
 
@@ -61,10 +53,14 @@ def clean_content(content):
 
 def get_post_text(post):
     """Extract text from a post object."""
-    if hasattr(post, 'value') and hasattr(post.value, 'text'):
+    # atproto records nearly always carry value.text, so try that first
+    # rather than probing with hasattr on every post
+    try:
         return post.value.text
-    elif hasattr(post, 'text'):
+    except AttributeError:
+        pass
+    try:
         return post.text
-    else:
+    except AttributeError:
         logging.warning("Post does not have 'value' or 'text' attribute: %s", post)
         return ""
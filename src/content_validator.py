@@ -7,10 +7,30 @@ before posting to Bluesky.
 
 import re
 import logging
+from collections import Counter
 
 class ContentValidator:
     """Validates generated content before posting."""
 
+    # Fixed patterns, compiled once per process
+    _URL_ONLY_RE = re.compile(r'^https?://[^\s]+$')
+    _URL_PRESENT_RE = re.compile(r'https?://')
+    _HASHTAG_RE = re.compile(r'#\w+')
+    _MENTION_RE = re.compile(r'@\w+')
+    _WS_COLLAPSE_RE = re.compile(r'\s+')
+
+    # Phrases that suggest the model returned an error instead of a post
+    _ERROR_INDICATORS = [
+        'error:',
+        'exception:',
+        'failed to',
+        'could not',
+        'unable to',
+        'traceback',
+        'stack trace'
+    ]
+    _ERROR_RE = re.compile('|'.join(map(re.escape, _ERROR_INDICATORS)))
+
     # ── Setup ─────────────────────────────────────────────────────────────────
 
     def __init__(self, char_limit=280, min_length=10):
@@ -37,6 +57,10 @@ class ContentValidator:
             r'\b(kill|die|suicide|harm yourself)\b',
             r'\b(hate|racist|bigot)\b',
         ]
+
+        # Compile once here rather than on every validate() call
+        self._spam_res = [re.compile(p, re.IGNORECASE) for p in self.spam_patterns]
+        self._harmful_res = [re.compile(p, re.IGNORECASE) for p in self.harmful_patterns]
         
         logging.info(f"Content validator initialized: {min_length}-{char_limit} chars")
     
@@ -58,6 +82,10 @@ class ContentValidator:
         if not content:
             return False, "Content is empty"
         
+        # Cheap whitespace probe before any string is copied
+        if content.isspace():
+            return False, "Content is empty or whitespace only"
+        
         content_stripped = content.strip()
         
         # Check if content is too short
@@ -68,26 +96,25 @@ class ContentValidator:
         if len(content_stripped) > self.char_limit:
             return False, f"Content exceeds limit ({len(content_stripped)} chars, max {self.char_limit})"
         
-        # Check for empty or whitespace-only content
-        if not content_stripped or content_stripped.isspace():
-            return False, "Content is empty or whitespace only"
-        
         # Check for repetitive content (same character repeated)
         if self._is_repetitive(content_stripped):
             return False, "Content appears to be repetitive or low quality"
         
+        # Lowercase once for the pattern and error checks below
+        content_lower = content_stripped.lower()
+        
         # Check for spam patterns
-        spam_found = self._check_patterns(content_stripped.lower(), self.spam_patterns)
+        spam_found = self._check_patterns(content_lower, self._spam_res)
         if spam_found:
             return False, f"Content contains spam-like patterns: {spam_found}"
         
         # Check for harmful content
-        harmful_found = self._check_patterns(content_stripped.lower(), self.harmful_patterns)
+        harmful_found = self._check_patterns(content_lower, self._harmful_res)
         if harmful_found:
             return False, f"Content contains potentially harmful language: {harmful_found}"
         
         # Check if content looks like an error message
-        if self._looks_like_error(content_stripped):
+        if self._looks_like_error(content_lower):
             return False, "Content appears to be an error message"
         
         # Check if content is just a URL
@@ -104,48 +131,33 @@ class ContentValidator:
         if len(content) < 10:
             return False
         
-        # Count most common character
-        char_counts = {}
-        for char in content:
-            if char.isalnum():  # Only count alphanumeric
-                char_counts[char] = char_counts.get(char, 0) + 1
+        # Count alphanumeric characters only; filter/Counter keep the loop in C
+        char_counts = Counter(filter(str.isalnum, content))
         
         if not char_counts:
             return True  # No alphanumeric characters
         
-        most_common_count = max(char_counts.values())
+        most_common_count = char_counts.most_common(1)[0][1]
         total_alnum = sum(char_counts.values())
         
         # If one character makes up more than threshold of content
         return (most_common_count / total_alnum) > threshold
     
     def _check_patterns(self, content, patterns):
-        """Check content against a list of regex patterns."""
+        """Check content against a list of compiled regex patterns."""
         for pattern in patterns:
-            match = re.search(pattern, content, re.IGNORECASE)
+            match = pattern.search(content)
             if match:
                 return match.group(0)
         return None
     
-    def _looks_like_error(self, content):
-        """Check if content looks like an error message."""
-        error_indicators = [
-            'error:',
-            'exception:',
-            'failed to',
-            'could not',
-            'unable to',
-            'traceback',
-            'stack trace'
-        ]
-        content_lower = content.lower()
-        return any(indicator in content_lower for indicator in error_indicators)
+    def _looks_like_error(self, content_lower):
+        """Check if already-lowercased content looks like an error message."""
+        return self._ERROR_RE.search(content_lower) is not None
     
     def _is_just_url(self, content):
         """Check if content is just a URL."""
-        # Simple URL pattern
-        url_pattern = r'^https?://[^\s]+$'
-        return bool(re.match(url_pattern, content.strip()))
+        return bool(self._URL_ONLY_RE.match(content.strip()))
     
     # ── Sanitization ────────────────────────────────────────────────────────────
 
@@ -166,7 +178,7 @@ class ContentValidator:
         sanitized = content.strip()
         
         # Remove multiple consecutive spaces
-        sanitized = re.sub(r'\s+', ' ', sanitized)
+        sanitized = self._WS_COLLAPSE_RE.sub(' ', sanitized)
         
         # Remove quotes that might have been added by the LLM
         if sanitized.startswith('"') and sanitized.endswith('"'):
@@ -195,7 +207,7 @@ class ContentValidator:
             'length': len(content),
             'words': len(content.split()),
             'lines': len(content.splitlines()),
-            'has_urls': bool(re.search(r'https?://', content)),
-            'has_hashtags': bool(re.search(r'#\w+', content)),
-            'has_mentions': bool(re.search(r'@\w+', content)),
+            'has_urls': bool(self._URL_PRESENT_RE.search(content)),
+            'has_hashtags': bool(self._HASHTAG_RE.search(content)),
+            'has_mentions': bool(self._MENTION_RE.search(content)),
         }
@@ -0,0 +1,40 @@
+"""
+Logging configuration for the bluesky-ollama bot.
+
+Sets up the shared log file and console output once per process. Other
+modules just log through the standard `logging` functions.
+"""
+
+import logging
+import os
+
+# ── Logging Setup ──────────────────────────────────────────────────────────────
+
+LOG_DIRECTORY = 'log'
+
+_configured = False
+
+def configure_logging():
+    """Configure file and console logging. Safe to call more than once."""
+    global _configured
+    if _configured:
+        return
+
+    # Ensure the log directory exists
+    os.makedirs(LOG_DIRECTORY, exist_ok=True)
+
+    # Set up logging to a file in the log directory
+    logging.basicConfig(
+        filename=os.path.join(LOG_DIRECTORY, 'general.log'),
+        level=logging.DEBUG,
+        format='%(asctime)s - %(levelname)s - %(message)s'
+    )
+
+    # Set up console logging
+    console_handler = logging.StreamHandler()
+    console_handler.setLevel(logging.INFO)
+    formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
+    console_handler.setFormatter(formatter)
+    logging.getLogger().addHandler(console_handler)
+
+    _configured = True
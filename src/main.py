@@ -9,61 +9,57 @@ to avoid predictable posting patterns.
 
 import os
 import argparse
+import time
 from datetime import datetime, timedelta
 import logging
 import re
+from bisect import bisect_right
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 from dotenv import load_dotenv
 from bsky_api import login, DID_resolve
 from ollama_gen import generate_post, get_account_posts
 from time_utils import calculate_refresh_interval, calculate_next_refresh, sleep_until_next_refresh
-
-# ── Logging Setup ──────────────────────────────────────────────────────────────
-
-# Ensure the log directory exists
-log_directory = 'log'
-if not os.path.exists(log_directory):
-    os.makedirs(log_directory)
-
-# Set up logging to a file in the log directory
-logging.basicConfig(
-    filename=os.path.join(log_directory, 'general.log'), 
-    level=logging.DEBUG,
-    format='%(asctime)s - %(levelname)s - %(message)s'
-)
-
-# Set up console logging
-console_handler = logging.StreamHandler()
-console_handler.setLevel(logging.INFO)
-formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
-console_handler.setFormatter(formatter)
-logging.getLogger().addHandler(console_handler)
+from logging_setup import configure_logging
 
 # ── Inline Rate Limiter ─────────────────────────────────────────────────────────
 
 # Duplicates the module-level RateLimiter in rate_limiter.py with tighter limits.
 # Kept here for historical reasons; the module-level version is the canonical one.
 
+HOUR_SECONDS = 3600.0
+DAY_SECONDS = 86400.0
+
 class RateLimiter:
     """Track posting rate to comply with Bluesky API limits."""
     def __init__(self):
         # Bluesky limits: 5000 points/hour, 35000 points/day
         # Creating a post = 3 points
         # We can create max 1666 records/hour and 11666 records/day
+        # time.monotonic() floats, appended in order so the lists stay sorted
         self.hourly_posts = []
         self.daily_posts = []
         self.max_hourly_posts = 1600  # Well under the 1666 cap — buffer for safety
         self.max_daily_posts = 11000  # Same logic for daily limit
     
+    def _expire_old_posts(self, now):
+        """Drop timestamps that have left the hourly and daily windows."""
+        one_hour_ago = now - HOUR_SECONDS
+        one_day_ago = now - DAY_SECONDS
+        
+        # Binary search for the expiry cut-off, then drop the prefix in one slice
+        del self.hourly_posts[:bisect_right(self.hourly_posts, one_hour_ago)]
+        del self.daily_posts[:bisect_right(self.daily_posts, one_day_ago)]
+    
     def can_post(self):
         """Check if we can post without exceeding rate limits."""
-        now = datetime.now()
+        # Expiry only ever shrinks the windows, so while both are under their
+        # caps the answer is yes without touching the timestamps at all
+        if len(self.hourly_posts) < self.max_hourly_posts and len(self.daily_posts) < self.max_daily_posts:
+            return True, None
         
         # Clean up old timestamps
-        one_hour_ago = now - timedelta(hours=1)
-        one_day_ago = now - timedelta(days=1)
-        
-        self.hourly_posts = [ts for ts in self.hourly_posts if ts > one_hour_ago]
-        self.daily_posts = [ts for ts in self.daily_posts if ts > one_day_ago]
+        self._expire_old_posts(time.monotonic())
         
         # Check limits
         if len(self.hourly_posts) >= self.max_hourly_posts:
@@ -78,28 +74,37 @@ class RateLimiter:
     
     def record_post(self):
         """Record a successful post."""
-        now = datetime.now()
+        now = time.monotonic()
         self.hourly_posts.append(now)
         self.daily_posts.append(now)
+        # Expire here too so the logged counts (and list sizes) stay accurate
+        self._expire_old_posts(now)
         logging.info(f"Rate limit status: {len(self.hourly_posts)} posts this hour, {len(self.daily_posts)} posts today")
     
     def get_wait_time(self, limit_type):
-        """Calculate how long to wait before posting again."""
+        """Calculate when posting is next allowed, as a wall-clock datetime."""
         if limit_type == "hourly" and self.hourly_posts:
-            oldest_post = min(self.hourly_posts)
-            wait_until = oldest_post + timedelta(hours=1)
-            return wait_until
+            expires_at = self.hourly_posts[0] + HOUR_SECONDS
         elif limit_type == "daily" and self.daily_posts:
-            oldest_post = min(self.daily_posts)
-            wait_until = oldest_post + timedelta(days=1)
-            return wait_until
-        return None
+            expires_at = self.daily_posts[0] + DAY_SECONDS
+        else:
+            return None
+        # Monotonic time has no epoch, so convert via the remaining seconds
+        return datetime.now() + timedelta(seconds=expires_at - time.monotonic())
 
 # ── Content Validation ─────────────────────────────────────────────────────────
 
 # Standalone validation function used by main.py's pipeline.
 # The ContentValidator class in content_validator.py is the canonical version.
 
+URL_PATTERN = re.compile(r'http[s]?://(?:[a-zA-Z]|[0-9]|[$-_@.&+]|[!*\\(\\),]|(?:%[0-9a-fA-F][0-9a-fA-F]))+')
+
+PLACEHOLDERS = [
+    'lorem ipsum', '[placeholder]', 'todo', 'xxx', 'test test',
+    'sample text', 'example post', 'generated text'
+]
+PLACEHOLDER_PATTERN = re.compile('|'.join(map(re.escape, PLACEHOLDERS)))
+
 def validate_content(text, char_limit=300):
     """
     Validate generated content before posting.
@@ -117,24 +122,19 @@ def validate_content(text, char_limit=300):
     if len(text) > char_limit:
         return False, f"Content exceeds character limit ({len(text)}/{char_limit})"
     
-    # Check for repetitive content (same phrase repeated multiple times)
-    words = text.lower().split()
+    text_lower = text.lower()
+
+    # Check for repetitive content (same three-word phrase more than twice)
+    words = text_lower.split()
     if len(words) > 5:
-        # Check for repeated sequences
-        for i in range(len(words) - 2):
-            phrase = ' '.join(words[i:i+3])
-            if text.lower().count(phrase) > 2:
-                return False, "Content contains repetitive patterns"
+        trigrams = Counter(zip(words, words[1:], words[2:]))
+        if trigrams.most_common(1)[0][1] > 2:
+            return False, "Content contains repetitive patterns"
     
     # Check for placeholder text
-    placeholders = [
-        'lorem ipsum', '[placeholder]', 'todo', 'xxx', 'test test',
-        'sample text', 'example post', 'generated text'
-    ]
-    text_lower = text.lower()
-    for placeholder in placeholders:
-        if placeholder in text_lower:
-            return False, f"Content contains placeholder text: {placeholder}"
+    placeholder = PLACEHOLDER_PATTERN.search(text_lower)
+    if placeholder:
+        return False, f"Content contains placeholder text: {placeholder.group(0)}"
     
     # Check for excessive punctuation
     if text.count('!') > 3 or text.count('?') > 3:
@@ -145,8 +145,7 @@ def validate_content(text, char_limit=300):
         return False, "Content is all caps"
     
     # Check for URLs that might be spam
-    url_pattern = r'http[s]?://(?:[a-zA-Z]|[0-9]|[$-_@.&+]|[!*\\(\\),]|(?:%[0-9a-fA-F][0-9a-fA-F]))+'
-    urls = re.findall(url_pattern, text)
+    urls = URL_PATTERN.findall(text)
     if len(urls) > 2:
         return False, "Content contains too many URLs"
     
@@ -166,6 +165,8 @@ def main():
                        help="Generate posts without actually posting them")
     args = parser.parse_args()
 
+    configure_logging()
+
     logging.info("=" * 80)
     logging.info("NEW EXECUTION OF BLUESKY-OLLAMA BOT")
     if args.dry_run:
@@ -199,20 +200,29 @@ def main():
     # Initialize rate limiter
     rate_limiter = RateLimiter()
 
-    # Login to source client and resolve DID
+    # Log in to both accounts and resolve the source DID. The three calls are
+    # independent network round-trips, so run them side by side.
     try:
         print("🔐 Logging into source account...")
-        source_client = login("SOURCE_HANDLE", "SRC_APP_PASS")
+        if not args.dry_run:
+            print("🔐 Logging into destination account...")
+
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            source_future = executor.submit(login, "SOURCE_HANDLE", "SRC_APP_PASS")
+            did_future = executor.submit(DID_resolve, source_handle)
+            if not args.dry_run:
+                destination_future = executor.submit(login, "DESTINATION_HANDLE", "DST_APP_PASS")
+
+        source_client = source_future.result()
         logging.info("Successfully logged in to source account.")
         print("✅ Successfully logged in to source account.")
         
-        source_did_package = DID_resolve(source_handle)
+        source_did_package = did_future.result()
         source_did = source_did_package['did']
         logging.info("Resolved source DID: %s", source_did)
 
         if not args.dry_run:
-            print("🔐 Logging into destination account...")
-            destination_client = login("DESTINATION_HANDLE", "DST_APP_PASS")
+            destination_client = destination_future.result()
             logging.info("Successfully logged in to destination account.")
             print("✅ Successfully logged in to destination account.\n")
         else:
@@ -272,11 +282,15 @@ def main():
                 text=generated_text,
                 langs=['en']
             )
-            post_link = response['uri']
             
-            # Record the post for rate limiting
+            # Record the post for rate limiting; it was created even if the
+            # response turns out to be missing its URI
             rate_limiter.record_post()
             
+            post_link = getattr(response, 'uri', None)
+            if not post_link:
+                logging.warning("Post response did not include a URI: %s", response)
+            
             logging.info("Posted to destination Bluesky account successfully: %s", post_link)
             print(f"✅ Posted successfully: {post_link}\n")
 
@@ -6,47 +6,96 @@ to generate new content in a matching style and tone.
 """
 
 import logging
-import os
+import httpx
 import ollama
 from clean import clean_content, get_post_text
 from bsky_api import retrieve_posts
 
-# ── Logging Setup ──────────────────────────────────────────────────────────────
-
-# Ensure the log directory exists
-log_directory = 'log'
-if not os.path.exists(log_directory):
-    os.makedirs(log_directory)
-
-# Set up logging to a file in the log directory
-logging.basicConfig(
-    filename=os.path.join(log_directory, 'general.log'),
-    level=logging.DEBUG,
-    format='%(asctime)s - %(levelname)s - %(message)s'
-)
-
 # ── Post Fetcher ───────────────────────────────────────────────────────────────
 
-def get_account_posts(client, client_did, limit=100):
-    """Fetch and clean posts from a Bluesky account."""
-    posts = retrieve_posts(client, client_did, limit)
+# Number of example posts included in the generation prompt
+SAMPLE_SIZE = 20
 
-    # Debugging: Print structure of the first post
-    if posts:
-        logging.debug("First post structure: %s", posts[0])
+def get_account_posts(client, client_did, limit=100, max_posts=SAMPLE_SIZE):
+    """
+    Fetch and clean posts from a Bluesky account.
 
-    # Ensure we are accessing the text correctly
+    Stops paginating once max_posts non-empty posts have been collected,
+    since generate_post only ever uses that many.
+    """
     cleaned_posts = []
-    for post in posts:
+    for index, post in enumerate(retrieve_posts(client, client_did, limit)):
+        # Debugging: Print structure of the first post
+        if index == 0:
+            logging.debug("First post structure: %s", post)
+
+        # Ensure we are accessing the text correctly
         text = get_post_text(post)
         if text:
             cleaned_text = clean_content(text)
             if cleaned_text.strip():  # Only add non-empty posts
                 cleaned_posts.append(cleaned_text)
+                if len(cleaned_posts) >= max_posts:
+                    break
 
-    logging.info(f"Retrieved and cleaned {len(cleaned_posts)} posts from account.")
+    logging.info("Retrieved and cleaned %d posts from account.", len(cleaned_posts))
     return cleaned_posts
 
+# ── Ollama Client ──────────────────────────────────────────────────────────────
+
+# One client per process so repeated generations share a connection pool
+_ollama_client = None
+
+def _get_client():
+    """Return the shared Ollama client, creating it on first use."""
+    global _ollama_client
+    if _ollama_client is None:
+        _ollama_client = ollama.Client(
+            limits=httpx.Limits(max_keepalive_connections=4, keepalive_expiry=60.0)
+        )
+    return _ollama_client
+
+# ── Prompt ─────────────────────────────────────────────────────────────────────
+
+# Static parts of the generation prompt; only the examples and the character
+# limit change between calls.
+PROMPT_HEADER = """You are a creative social media post generator. Based on the following posts from a Bluesky account, generate a single new post that matches the style, tone, and topics of the original content.
+
+Example posts from the account:
+"""
+
+PROMPT_FOOTER = """
+
+Guidelines:
+- Match the writing style, tone, and personality of the original posts
+- Keep it concise and engaging
+- Do not exceed {char_limit} characters
+- Do not include hashtags unless they were common in the examples
+- Make it feel natural and authentic to the account's voice
+- Focus on similar topics or themes
+- DO NOT use quotation marks or indicate this is a generated post
+
+Generate only the post text, nothing else:"""
+
+# ── Truncation ─────────────────────────────────────────────────────────────────
+
+def _truncate(text, char_limit):
+    """Cut text to char_limit, preferring a sentence end, then a word boundary."""
+    text = text[:char_limit]
+
+    # Only search the tail: a cut before 70% (sentence) or 80% (word) of the
+    # limit is never taken, and the space search is skipped if a period is found
+    last_period = text.rfind('.', int(char_limit * 0.7) + 1)
+    if last_period != -1:  # If we can cut at a sentence
+        return text[:last_period + 1]
+
+    last_space = text.rfind(' ', int(char_limit * 0.8) + 1)
+    if last_space != -1:  # If we can cut at a word
+        return text[:last_space]
+
+    # Otherwise just hard cut
+    return text
+
 # ── Content Generation ─────────────────────────────────────────────────────────
 
 def generate_post(posts, model_name, char_limit):
@@ -62,7 +111,7 @@ def generate_post(posts, model_name, char_limit):
         Generated post text
     """
     try:
-        client = ollama.Client()
+        client = _get_client()
 
         # Prepare context from posts
         if not posts:
@@ -70,28 +119,14 @@ def generate_post(posts, model_name, char_limit):
             return "No content available to generate from."
 
         # Sample posts to include in context (limit to avoid token limits)
-        sample_size = min(20, len(posts))
+        sample_size = min(SAMPLE_SIZE, len(posts))
         sample_posts = posts[:sample_size]
-        posts_context = "\n\n".join([f"- {post}" for post in sample_posts])
+        posts_context = "\n\n".join("- " + post for post in sample_posts)
 
         # Create prompt for Ollama
-        prompt = f"""You are a creative social media post generator. Based on the following posts from a Bluesky account, generate a single new post that matches the style, tone, and topics of the original content.
-
-Example posts from the account:
-{posts_context}
-
-Guidelines:
-- Match the writing style, tone, and personality of the original posts
-- Keep it concise and engaging
-- Do not exceed {char_limit} characters
-- Do not include hashtags unless they were common in the examples
-- Make it feel natural and authentic to the account's voice
-- Focus on similar topics or themes
-- DO NOT use quotation marks or indicate this is a generated post
+        prompt = PROMPT_HEADER + posts_context + PROMPT_FOOTER.format(char_limit=char_limit)
 
-Generate only the post text, nothing else:"""
-
-        logging.debug(f"Generating post with model: {model_name}")
+        logging.debug("Generating post with model: %s", model_name)
         
         # Generate using Ollama
         response = client.generate(model=model_name, prompt=prompt)
@@ -103,19 +138,11 @@ Generate only the post text, nothing else:"""
         # Ensure we don't exceed character limit
         if len(generated_text) > char_limit:
             # Try to cut at a sentence or word boundary
-            generated_text = generated_text[:char_limit]
-            last_period = generated_text.rfind('.')
-            last_space = generated_text.rfind(' ')
-            
-            if last_period > char_limit * 0.7:  # If we can cut at a sentence
-                generated_text = generated_text[:last_period + 1]
-            elif last_space > char_limit * 0.8:  # If we can cut at a word
-                generated_text = generated_text[:last_space]
-            # Otherwise just hard cut
-
-        logging.info(f"Generated post ({len(generated_text)} chars): {generated_text}")
+            generated_text = _truncate(generated_text, char_limit)
+
+        logging.info("Generated post (%d chars): %s", len(generated_text), generated_text)
         return generated_text
 
     except Exception as e:
-        logging.error(f"Error generating post with Ollama: {e}")
+        logging.error("Error generating post with Ollama: %s", e)
         return f"Error generating post: {str(e)}"
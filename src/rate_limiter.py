@@ -15,45 +15,245 @@ Maximum posts per day: 11,666
 We'll be conservative and track our own limits.
 """
 
+import asyncio
+import math
 import time
 import logging
-from datetime import datetime, timedelta
-from collections import deque
+import threading
+from collections import namedtuple
+
+logger = logging.getLogger(__name__)
+
+HOUR_SECONDS = 3600.0
+DAY_SECONDS = 86400.0
+
+# ── State Stores ───────────────────────────────────────────────────────────────
+
+# Stores hold one theoretical arrival time (TAT) per key and update them
+# atomically, so the limiter itself keeps no mutable state.
+
+class MemoryStore:
+    """Keeps limiter state in this process. Resets when the process restarts."""
+
+    def __init__(self):
+        self._tats = {}
+        # Python has no compare-and-swap on floats, so a lock guards the
+        # read-modify-write of the TATs. It is held for a few float ops only.
+        self._lock = threading.Lock()
+
+    def now(self):
+        """
+        Current time on this store's clock.
+
+        Monotonic, so NTP or DST adjustments to the wall clock can't shrink
+        or stretch the windows.
+        """
+        return time.monotonic()
+
+    def get(self, keys):
+        """Return the TAT for each key, 0.0 if it has never been set."""
+        return [self._tats.get(key, 0.0) for key in keys]
+
+    def advance(self, keys, increments, now, tolerances=None):
+        """
+        Push each key's TAT forward by its increment, all or nothing.
+
+        If tolerances are given, nothing changes unless every TAT is within
+        its tolerance of now.
+
+        Returns:
+            bool: True if the TATs were advanced
+        """
+        with self._lock:
+            tats = [max(now, self._tats.get(key, 0.0)) for key in keys]
+            if tolerances and any(tat - now > tol for tat, tol in zip(tats, tolerances)):
+                return False
+            for key, tat, inc in zip(keys, tats, increments):
+                self._tats[key] = tat + inc
+            return True
+
+# Same check-and-advance as MemoryStore.advance, run atomically inside Redis.
+# ARGV: now, then one increment per key, then one tolerance per key ('' for none).
+_REDIS_ADVANCE = """
+local now = tonumber(ARGV[1])
+local n = #KEYS
+local tats = {}
+for i = 1, n do
+    local tat = math.max(now, tonumber(redis.call('GET', KEYS[i])) or 0)
+    local tolerance = tonumber(ARGV[1 + n + i])
+    if tolerance and tat - now > tolerance then
+        return 0
+    end
+    tats[i] = tat + tonumber(ARGV[1 + i])
+end
+for i = 1, n do
+    -- tostring() keeps only 14 significant digits, i.e. 0.1 ms at Unix-time scale
+    redis.call('SET', KEYS[i], string.format('%.17g', tats[i]), 'PX', math.ceil((tats[i] - now) * 1000))
+end
+return 1
+"""
+
+class RedisStore:
+    """
+    Keeps limiter state in Redis, shared by every process using the same prefix.
+
+    State survives restarts, and keys expire by themselves once their window
+    has fully drained. Uses wall-clock time, since monotonic clocks are not
+    comparable across processes or machines.
+    """
+
+    def __init__(self, client, prefix='rate_limiter'):
+        """
+        Args:
+            client: A redis.Redis (or compatible) client
+            prefix: Key prefix, e.g. one per bot account
+        """
+        self._client = client
+        self._prefix = prefix
+        self._advance = client.register_script(_REDIS_ADVANCE)
+
+    def now(self):
+        """Current time on this store's clock."""
+        return time.time()
+
+    def _keys(self, keys):
+        return [f"{self._prefix}:{key}" for key in keys]
+
+    def get(self, keys):
+        """Return the TAT for each key, 0.0 if it is unset or expired."""
+        return [float(tat) if tat is not None else 0.0 for tat in self._client.mget(self._keys(keys))]
+
+    def advance(self, keys, increments, now, tolerances=None):
+        """Atomic equivalent of MemoryStore.advance."""
+        tolerances = tolerances or [''] * len(keys)
+        return bool(self._advance(keys=self._keys(keys), args=[now, *increments, *tolerances]))
+
+# ── Rate Limiter ───────────────────────────────────────────────────────────────
+
+# Per window: count is operations still held against the burst (they drain
+# steadily, not all at once), and remaining is how many more may go through
+# right now, so count + remaining == burst. The limit is the rolling-period
+# cap, which is larger than the burst; don't derive remaining from it.
+RateStats = namedtuple('RateStats', [
+    'hourly_count', 'hourly_limit', 'hourly_burst', 'hourly_remaining',
+    'daily_count', 'daily_limit', 'daily_burst', 'daily_remaining',
+])
+
+# How long get_stats() may return the same snapshot when nothing was recorded
+STATS_CACHE_TTL = 1.0  # Seconds
+
+# Float error from summing increments onto a TAT, which is worst at
+# time.time() magnitudes (RedisStore), can leave an exactly full window a
+# few microseconds short. This much slack on the tolerance absorbs it; it
+# is far smaller than any increment, so it never lets an extra operation in.
+CLOCK_SLACK = 1e-3  # Seconds
+
+class _Window:
+    """One GCRA window: a limit over a period, tracked by a single TAT."""
+
+    __slots__ = ('label', 'key', 'limit', 'period', 'burst', 'increment', 'tolerance')
+
+    def __init__(self, label, key, limit, period):
+        # The burst/rate split below needs at least one slot to work with
+        if limit < 1:
+            raise ValueError(f"{label} limit must be at least 1, got {limit}")
+        self.label = label
+        self.key = key
+        self.limit = limit
+        self.period = period
+        # A rolling period can see a full burst and then a period's worth of
+        # steady rate, i.e. up to burst - 1 + rate * period operations. Split
+        # the limit so that comes to exactly limit; a full-limit burst at a
+        # rate of limit / period would allow 2 * limit - 1.
+        self.burst = max(1, limit // 2)
+        # Seconds each operation adds to the TAT
+        self.increment = period / (limit - self.burst + 1)
+        # How far ahead of now the TAT may be before the window is full. The
+        # stores check against this same value, so they always agree with
+        # is_full() and used().
+        self.tolerance = (self.burst - 1) * self.increment + CLOCK_SLACK
+
+    def is_full(self, tat, now):
+        """Whether another operation would exceed the limit."""
+        return tat - now > self.tolerance
+
+    def wait_time(self, tat, now):
+        """Seconds until the window has room again, 0 if it already does."""
+        return max(0.0, tat - self.tolerance - now)
+
+    def used(self, tat, now):
+        """Convert how far the TAT is ahead of now back into an operation count."""
+        # Decide the full case with is_full() so the two can't disagree
+        if self.is_full(tat, now):
+            return self.burst
+        slots = (tat - now - CLOCK_SLACK) / self.increment
+        return min(self.burst - 1, max(0, math.ceil(slots)))
 
 class RateLimiter:
-    """Rate limiter to respect Bluesky's API limits."""
+    """
+    Rate limiter to respect Bluesky's API limits.
+
+    Uses GCRA (the Generic Cell Rate Algorithm): each window keeps a single
+    theoretical arrival time (TAT) instead of a timestamp per operation.
+    Every operation pushes the TAT forward by a fixed increment, and an
+    operation is allowed while the TAT is at most burst - 1 increments
+    ahead of now. Each limit is split between an immediate burst of about half
+    the limit and a steady rate for the rest, so no rolling hour or day
+    ever sees more than `limit` operations. All in O(1) time and memory
+    whatever the limits are.
+    """
+
+    __slots__ = (
+        'hourly_limit', 'daily_limit', '_store',
+        '_hourly', '_daily', '_windows', '_keys', '_increments', '_tolerances',
+        '_stats', '_stats_at',
+    )
 
     # ── Setup ─────────────────────────────────────────────────────────────────
 
-    def __init__(self, hourly_limit=100, daily_limit=500):
+    def __init__(self, hourly_limit=100, daily_limit=500, store=None):
         """
         Initialize rate limiter.
         
+        Neither limit is ever exceeded in any rolling hour or day, which
+        costs throughput: only limit // 2 operations can go through at once,
+        and the sustained rate is limit - limit // 2 + 1 per period, about
+        half the limit. A steady 90/hour against hourly_limit=100 is refused
+        part of the time.
+
         Args:
-            hourly_limit: Maximum operations per hour (default: 100, well below Bluesky's 1,666)
-            daily_limit: Maximum operations per day (default: 500, well below Bluesky's 11,666)
+            hourly_limit: Maximum operations in any rolling hour (default: 100, well below Bluesky's 1,666)
+            daily_limit: Maximum operations in any rolling day (default: 500, well below Bluesky's 11,666)
+            store: Where to keep state (default: a new MemoryStore). Pass a
+                RedisStore to share limits between processes and restarts.
+
+        Raises:
+            ValueError: If either limit is below 1
         """
         self.hourly_limit = hourly_limit
         self.daily_limit = daily_limit
+        self._store = store if store is not None else MemoryStore()
+
+        self._hourly = _Window('Hourly', 'hour', hourly_limit, HOUR_SECONDS)
+        self._daily = _Window('Daily', 'day', daily_limit, DAY_SECONDS)
+        self._windows = (self._hourly, self._daily)
+        self._keys = [w.key for w in self._windows]
+        self._increments = [w.increment for w in self._windows]
+        self._tolerances = [w.tolerance for w in self._windows]
+
+        # Last get_stats() result; cleared whenever an operation is recorded
+        self._stats = None
+        self._stats_at = 0.0
         
-        # Track timestamps of operations
-        self.hourly_operations = deque()  # timestamps in last hour
-        self.daily_operations = deque()   # timestamps in last day
-        
-        logging.info(f"Rate limiter initialized: {hourly_limit}/hour, {daily_limit}/day")
-    
-    def _clean_old_operations(self):
-        """Remove operations outside the time windows."""
-        now = datetime.now()
-        hour_ago = now - timedelta(hours=1)
-        day_ago = now - timedelta(days=1)
+        logger.info("Rate limiter initialized: %d/hour, %d/day", hourly_limit, daily_limit)
 
-        # Pop expired hourly and daily entries from the front of the deque
-        while self.hourly_operations and self.hourly_operations[0] < hour_ago:
-            self.hourly_operations.popleft()
+    def _now(self):
+        """Current time for the limiter's windows; read once per public call."""
+        return self._store.now()
 
-        while self.daily_operations and self.daily_operations[0] < day_ago:
-            self.daily_operations.popleft()
+    def _tats(self):
+        """Read the current TAT of every window from the store."""
+        return self._store.get(self._keys)
 
     # ── Check & Record ─────────────────────────────────────────────────────────
 
@@ -64,46 +264,141 @@ class RateLimiter:
         Returns:
             tuple: (bool, str) - (can_proceed, reason_if_not)
         """
-        self._clean_old_operations()
-        
-        if len(self.hourly_operations) >= self.hourly_limit:
-            return False, f"Hourly rate limit reached ({self.hourly_limit} operations/hour)"
-        
-        if len(self.daily_operations) >= self.daily_limit:
-            return False, f"Daily rate limit reached ({self.daily_limit} operations/day)"
-        
+        return self._check(self._now(), self._tats())
+
+    def _check(self, now, tats):
+        """Check every window against an already-read timestamp."""
+        for window, tat in zip(self._windows, tats):
+            if window.is_full(tat, now):
+                return False, (
+                    f"{window.label} rate limit reached (burst of {window.burst} used, "
+                    f"{window.limit} operations/{window.key} max)"
+                )
         return True, ""
     
     def record_operation(self):
         """Record that an operation was performed."""
-        now = datetime.now()
-        self.hourly_operations.append(now)
-        self.daily_operations.append(now)
-        
-        self._clean_old_operations()
-        
-        hourly_count = len(self.hourly_operations)
-        daily_count = len(self.daily_operations)
+        self.record_operations(1)
+
+    def record_operations(self, n):
+        """
+        Record that n operations were performed, e.g. after a burst.
+
+        Advances each window by n slots in a single store update and logs
+        once, rather than once per operation.
+
+        Args:
+            n: Number of operations performed
+        """
+        if n <= 0:
+            return
+        now = self._now()
+        self._store.advance(self._keys, [inc * n for inc in self._increments], now)
+        self._stats = None
+        self._log_recorded(now, n)
+
+    def try_acquire(self):
+        """
+        Check the limits and record an operation in one atomic step.
+
+        Use this instead of can_proceed() followed by record_operation()
+        when several threads or processes share the limiter, so two of them
+        can't both take the last slot.
+
+        Returns:
+            tuple: (bool, str) - (acquired, reason_if_not)
+        """
+        now = self._now()
+        if self._store.advance(self._keys, self._increments, now, self._tolerances):
+            self._stats = None
+            self._log_recorded(now)
+            return True, ""
+        # Refused; re-read to report which window is full. The re-read can
+        # already show room (e.g. a Redis key expired in between), but this
+        # attempt still didn't acquire a slot.
+        _, reason = self._check(now, self._tats())
+        return False, reason or "Rate limit reached"
+
+    def _log_recorded(self, now, n=1):
+        """Log the window counts after n operations were recorded."""
+        # Skip the store read as well as the formatting when debug is off
+        if not logger.isEnabledFor(logging.DEBUG):
+            return
+        hour_tat, day_tat = self._tats()
+        hourly_count = self._hourly.used(hour_tat, now)
+        daily_count = self._daily.used(day_tat, now)
         
-        logging.debug(
-            f"Operation recorded. Current counts: {hourly_count}/{self.hourly_limit} (hour), "
-            f"{daily_count}/{self.daily_limit} (day)"
+        logger.debug(
+            "Recorded %d operation(s). Current counts: %d/%d (hour), %d/%d (day)",
+            n, hourly_count, self.hourly_limit, daily_count, self.daily_limit
         )
     
     # ── Monitoring ──────────────────────────────────────────────────────────────
 
     def get_stats(self):
-        """Get current rate limit statistics."""
-        self._clean_old_operations()
-        return {
-            'hourly_count': len(self.hourly_operations),
-            'hourly_limit': self.hourly_limit,
-            'hourly_remaining': self.hourly_limit - len(self.hourly_operations),
-            'daily_count': len(self.daily_operations),
-            'daily_limit': self.daily_limit,
-            'daily_remaining': self.daily_limit - len(self.daily_operations)
-        }
+        """
+        Get current rate limit statistics.
+
+        Repeated calls within STATS_CACHE_TTL of each other return the same
+        snapshot unless this limiter recorded an operation in between.
+        Operations recorded by other processes through a shared store can
+        take up to that long to show.
+
+        Returns:
+            RateStats: named tuple of counts, limits, bursts and remaining
+                operations; remaining is relative to the burst
+        """
+        now = self._now()
+        if self._stats is not None and now - self._stats_at < STATS_CACHE_TTL:
+            return self._stats
+
+        hour_tat, day_tat = self._tats()
+        hourly_count = self._hourly.used(hour_tat, now)
+        daily_count = self._daily.used(day_tat, now)
+        self._stats = RateStats(
+            hourly_count=hourly_count,
+            hourly_limit=self.hourly_limit,
+            hourly_burst=self._hourly.burst,
+            hourly_remaining=self._hourly.burst - hourly_count,
+            daily_count=daily_count,
+            daily_limit=self.daily_limit,
+            daily_burst=self._daily.burst,
+            daily_remaining=self._daily.burst - daily_count,
+        )
+        self._stats_at = now
+        return self._stats
     
+    # ── Waiting ─────────────────────────────────────────────────────────────────
+
+    def retry_after(self):
+        """
+        Seconds until an operation would be allowed.
+
+        Returns:
+            float: 0.0 if an operation can proceed now
+        """
+        now = self._now()
+        return max(window.wait_time(tat, now) for window, tat in zip(self._windows, self._tats()))
+
+    async def await_if_needed(self):
+        """
+        Asynchronously wait if rate limit is reached.
+
+        Unlike wait_if_needed(), this yields to the event loop while waiting,
+        so other tasks keep running, and leaves any user-facing output to the
+        caller.
+
+        Returns:
+            bool: True if had to wait, False otherwise
+        """
+        wait_seconds = self.retry_after()
+        if wait_seconds <= 0:
+            return False
+
+        logger.info("Waiting %.0f seconds for rate limit to reset...", wait_seconds)
+        await asyncio.sleep(wait_seconds + 1)  # Add 1 second buffer
+        return True
+
     def wait_if_needed(self):
         """
         Wait if rate limit is reached.
@@ -111,36 +406,11 @@ class RateLimiter:
         Returns:
             bool: True if had to wait, False otherwise
         """
-        can_proceed, reason = self.can_proceed()
-        
-        if not can_proceed:
-            logging.warning(f"Rate limit reached: {reason}")
-            
-            # Calculate wait time
-            self._clean_old_operations()
-            
-            if len(self.hourly_operations) >= self.hourly_limit:
-                # Wait until oldest hourly operation expires
-                oldest = self.hourly_operations[0]
-                wait_until = oldest + timedelta(hours=1)
-                wait_seconds = (wait_until - datetime.now()).total_seconds()
-                
-                if wait_seconds > 0:
-                    logging.info(f"Waiting {wait_seconds:.0f} seconds for hourly rate limit to reset...")
-                    print(f"⏳ Rate limit reached. Waiting {wait_seconds:.0f} seconds...")
-                    time.sleep(wait_seconds + 1)  # Add 1 second buffer
-                    return True
-            
-            if len(self.daily_operations) >= self.daily_limit:
-                # Wait until oldest daily operation expires
-                oldest = self.daily_operations[0]
-                wait_until = oldest + timedelta(days=1)
-                wait_seconds = (wait_until - datetime.now()).total_seconds()
-                
-                if wait_seconds > 0:
-                    logging.info(f"Waiting {wait_seconds:.0f} seconds for daily rate limit to reset...")
-                    print(f"⏳ Daily rate limit reached. Waiting {wait_seconds:.0f} seconds...")
-                    time.sleep(wait_seconds + 1)  # Add 1 second buffer
-                    return True
-        
-        return False
+        wait_seconds = self.retry_after()
+        if wait_seconds <= 0:
+            return False
+
+        logger.warning("Rate limit reached. Waiting %.0f seconds for it to reset...", wait_seconds)
+        print(f"⏳ Rate limit reached. Waiting {wait_seconds:.0f} seconds...")
+        time.sleep(wait_seconds + 1)  # Add 1 second buffer
+        return True
@@ -10,21 +10,6 @@ import random
 from datetime import datetime, timedelta
 import time
 import logging
-import os
-
-# ── Logging Setup ──────────────────────────────────────────────────────────────
-
-# Ensure the log directory exists
-log_directory = 'log'
-if not os.path.exists(log_directory):
-    os.makedirs(log_directory)
-
-# Set up logging to a file in the log directory
-logging.basicConfig(
-    filename=os.path.join(log_directory, 'general.log'), 
-    level=logging.DEBUG,
-    format='%(asctime)s - %(levelname)s - %(message)s'
-)
 
 # ── Scheduling ─────────────────────────────────────────────────────────────────
 
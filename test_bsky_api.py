@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+Tests for the Bluesky API wrapper in bsky_api.py.
+Run with pytest. The atproto client is faked, so nothing touches the network.
+"""
+
+import sys
+import os
+from types import SimpleNamespace
+import pytest
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+
+from atproto import exceptions
+from atproto_client.request import Response
+
+import bsky_api
+
+# ── Helpers ──────────────────────────────────────────────────────────────────
+
+# Unix time the fake clock reports to _retry_delay
+_NOW = 1_700_000_000
+
+def _response(status_code, headers=None):
+    """An atproto error response with the given status and headers."""
+    return Response(success=False, status_code=status_code, content=None, headers=headers or {})
+
+def _client(*outcomes):
+    """
+    A fake client whose post.list() works through outcomes in order,
+    raising exceptions and returning anything else.
+    """
+    calls = []
+
+    def list_posts(did, limit=None, cursor=None):
+        calls.append(cursor)
+        outcome = outcomes[len(calls) - 1]
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+    post = SimpleNamespace(list=list_posts)
+    client = SimpleNamespace(app=SimpleNamespace(bsky=SimpleNamespace(feed=SimpleNamespace(post=post))))
+    return client, calls
+
+@pytest.fixture
+def slept(monkeypatch):
+    """Record retry sleeps instead of sleeping, on a frozen wall clock."""
+    delays = []
+    monkeypatch.setattr(bsky_api.time, 'sleep', delays.append)
+    monkeypatch.setattr(bsky_api.time, 'time', lambda: _NOW)
+    return delays
+
+# ── Fetch Retries ────────────────────────────────────────────────────────────
+
+def test_permanent_error_raises_immediately(slept):
+    """A 404 won't go away on retry, so it is raised on the first attempt."""
+    client, calls = _client(exceptions.RequestException(_response(404)))
+
+    with pytest.raises(exceptions.RequestException):
+        bsky_api._fetch_page(client, 'did:plc:test', 100, None)
+    assert len(calls) == 1
+    assert slept == []
+
+@pytest.mark.parametrize("error", [
+    exceptions.RequestException(_response(503)),
+    exceptions.NetworkError(),
+    exceptions.InvokeTimeoutError(),
+], ids=["5xx", "no response", "timeout"])
+def test_transient_error_backs_off_then_raises(slept, error):
+    """Transient failures back off 2/4/8 s, then the last error is raised."""
+    client, calls = _client(*[error] * (bsky_api.FETCH_RETRIES + 1))
+
+    with pytest.raises(type(error)):
+        bsky_api._fetch_page(client, 'did:plc:test', 100, None)
+    assert len(calls) == bsky_api.FETCH_RETRIES + 1
+    assert slept == [2.0, 4.0, 8.0]
+
+def test_transient_error_recovers(slept):
+    """A retry that succeeds returns its page."""
+    page = SimpleNamespace(records={}, cursor=None)
+    client, calls = _client(exceptions.RequestException(_response(502)), page)
+
+    assert bsky_api._fetch_page(client, 'did:plc:test', 100, None) is page
+    assert slept == [2.0]
+
+def test_rate_limit_uses_retry_after(slept):
+    """A 429 waits for the server's retry-after rather than backing off."""
+    error = exceptions.RateLimitExceededError(_response(429, {'retry-after': '30', 'ratelimit-reset': str(_NOW + 90)}))
+    page = SimpleNamespace(records={}, cursor=None)
+    client, _ = _client(error, page)
+
+    assert bsky_api._fetch_page(client, 'did:plc:test', 100, None) is page
+    assert slept == [30.0]
+
+def test_rate_limit_falls_back_to_reset_at(slept):
+    """Without retry-after, a 429 waits until the window resets."""
+    error = exceptions.RateLimitExceededError(_response(429, {'ratelimit-reset': str(_NOW + 90)}))
+    page = SimpleNamespace(records={}, cursor=None)
+    client, _ = _client(error, page)
+
+    assert bsky_api._fetch_page(client, 'did:plc:test', 100, None) is page
+    assert slept == [90.0]
+
+def test_long_rate_limit_raises_without_sleeping(slept):
+    """A rate-limit wait over FETCH_MAX_RATE_WAIT gives up straight away."""
+    wait = str(int(bsky_api.FETCH_MAX_RATE_WAIT) + 1)
+    client, calls = _client(exceptions.RateLimitExceededError(_response(429, {'retry-after': wait})))
+
+    with pytest.raises(exceptions.RateLimitExceededError):
+        bsky_api._fetch_page(client, 'did:plc:test', 100, None)
+    assert len(calls) == 1
+    assert slept == []
+
+# ── DID Cache ────────────────────────────────────────────────────────────────
+
+class FakeResolver:
+    """Stands in for IdResolver, counting lookups. Handles in `missing` have no document."""
+
+    def __init__(self, missing=()):
+        self.lookups = []
+        self.handle = SimpleNamespace(resolve=self._resolve_handle)
+        self._missing = {f"did:plc:{handle}" for handle in missing}
+        self.did = SimpleNamespace(resolve=lambda did: None if did in self._missing else {'id': did})
+
+    def _resolve_handle(self, handle):
+        self.lookups.append(handle)
+        return f"did:plc:{handle}"
+
+@pytest.fixture
+def clock(monkeypatch):
+    """A frozen monotonic clock for the DID cache, with an empty cache."""
+    now = [1000.0]
+    monkeypatch.setattr(bsky_api.time, 'monotonic', lambda: now[0])
+    monkeypatch.setattr(bsky_api, '_did_cache', {})
+    return now
+
+def test_did_cached_until_ttl(monkeypatch, clock):
+    """A resolved handle is reused until DID_CACHE_TTL, then looked up again."""
+    resolver = FakeResolver()
+    monkeypatch.setattr(bsky_api, '_RESOLVER', resolver)
+
+    package = bsky_api.DID_resolve('alice')
+    assert package == {'did': 'did:plc:alice', 'did_doc': {'id': 'did:plc:alice'}}
+
+    clock[0] += bsky_api.DID_CACHE_TTL - 1
+    assert bsky_api.DID_resolve('alice') is package
+    assert resolver.lookups == ['alice']
+
+    clock[0] += 1
+    assert bsky_api.DID_resolve('alice') == package
+    assert resolver.lookups == ['alice', 'alice']
+
+def test_did_cache_evicts_oldest(monkeypatch, clock):
+    """Once DID_CACHE_SIZE entries are held, the oldest is dropped first."""
+    resolver = FakeResolver()
+    monkeypatch.setattr(bsky_api, '_RESOLVER', resolver)
+    monkeypatch.setattr(bsky_api, 'DID_CACHE_SIZE', 2)
+
+    for handle in ('alice', 'bob', 'carol'):
+        bsky_api.DID_resolve(handle)
+    assert list(bsky_api._did_cache) == ['bob', 'carol']
+
+    bsky_api.DID_resolve('bob')
+    bsky_api.DID_resolve('alice')
+    assert resolver.lookups == ['alice', 'bob', 'carol', 'alice']
+
+def test_missing_did_doc_not_cached(monkeypatch, clock):
+    """A handle whose document can't be found is looked up again next time."""
+    resolver = FakeResolver(missing=('ghost',))
+    monkeypatch.setattr(bsky_api, '_RESOLVER', resolver)
+
+    assert bsky_api.DID_resolve('ghost') == {'did': 'did:plc:ghost', 'did_doc': None}
+    assert 'ghost' not in bsky_api._did_cache
+
+    bsky_api.DID_resolve('ghost')
+    assert resolver.lookups == ['ghost', 'ghost']
@@ -0,0 +1,38 @@
+#!/usr/bin/env python3
+"""
+Tests for post cleaning in clean.py.
+Run with pytest.
+"""
+
+import sys
+import os
+import pytest
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+
+from clean import clean_content
+
+# ── Test Cases ───────────────────────────────────────────────────────────────
+# Special characters are removed before emoji shortcodes, so a special
+# character between colons changes which colons pair up.
+
+CLEAN_CASES = [
+    # (content, expected, description)
+    ("", "", "Empty content"),
+    ("   ", "", "Whitespace only"),
+    ("Hello <b>world</b>!", "Hello world!", "HTML tags stripped"),
+    ("Fish &amp; chips", "Fish chips", "Entities decoded, then stripped as special"),
+    ("&lt;b&gt;bold&lt;/b&gt;", "bboldb", "Encoded markup is not treated as tags"),
+    ("hi @alice.bsky.social there", "hi there", "Handle removed"),
+    ("nice :smile: post", "nice post", "Shortcode removed"),
+    ("a:b<:c:", "ac:", "Special character between colons re-pairs them"),
+    (":a😀b:", "", "Shortcode with a special character inside"),
+    ("a:b:c:d", "ac:d", "Leftmost colons pair first"),
+    ("time 10:30: now", "time 10 now", "Digits between colons count as a shortcode"),
+]
+
+# ── Tests ────────────────────────────────────────────────────────────────────
+
+@pytest.mark.parametrize("content,expected,description", CLEAN_CASES, ids=[c[2] for c in CLEAN_CASES])
+def test_clean_content(content, expected, description):
+    """Each input cleans to exactly the expected text."""
+    assert clean_content(content) == expected
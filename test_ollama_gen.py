@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Tests for post fetching in ollama_gen.py.
+Run with pytest. The atproto client is faked, so nothing touches the network.
+"""
+
+import sys
+import os
+import logging
+from types import SimpleNamespace
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+
+from ollama_gen import get_account_posts, SAMPLE_SIZE
+
+# ── Helpers ──────────────────────────────────────────────────────────────────
+
+def _page(texts, cursor):
+    """One page of post records, keyed like the SDK's list() response."""
+    records = {
+        f"at://did:plc:test/app.bsky.feed.post/{text or index}": SimpleNamespace(value=SimpleNamespace(text=text))
+        for index, text in enumerate(texts)
+    }
+    return SimpleNamespace(records=records, cursor=cursor)
+
+def _client(pages):
+    """A fake client that serves pages in cursor order and records each request."""
+    requested = []
+
+    def list_posts(did, limit=None, cursor=None):
+        requested.append(cursor)
+        return pages[cursor]
+
+    post = SimpleNamespace(list=list_posts)
+    client = SimpleNamespace(app=SimpleNamespace(bsky=SimpleNamespace(feed=SimpleNamespace(post=post))))
+    return client, requested
+
+# ── Tests ────────────────────────────────────────────────────────────────────
+
+def test_stops_after_sample_size(caplog):
+    """Pagination stops at SAMPLE_SIZE non-empty posts and still logs its total."""
+    # 12 usable posts on the first page, so the sample fills partway through the second
+    first = [f"first page post {i}" for i in range(12)] + ["", "   ", "<b></b>"]
+    second = [f"second page post {i}" for i in range(15)]
+    third = [f"third page post {i}" for i in range(15)]
+    client, requested = _client({None: _page(first, 'p2'), 'p2': _page(second, 'p3'), 'p3': _page(third, None)})
+
+    with caplog.at_level(logging.INFO):
+        posts = get_account_posts(client, 'did:plc:test')
+
+    assert len(posts) == SAMPLE_SIZE
+    assert posts[-1] == f"second page post {SAMPLE_SIZE - 12 - 1}"
+    assert requested == [None, 'p2']
+    assert "Total posts retrieved: 30" in caplog.text
+
+def test_short_account_reads_every_page(caplog):
+    """An account with fewer than SAMPLE_SIZE posts is read to the last page."""
+    client, requested = _client({None: _page(["one post here"], 'p2'), 'p2': _page(["and another"], None)})
+
+    with caplog.at_level(logging.INFO):
+        posts = get_account_posts(client, 'did:plc:test')
+
+    assert posts == ["one post here", "and another"]
+    assert requested == [None, 'p2']
+    assert "Total posts retrieved: 2" in caplog.text
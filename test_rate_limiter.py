@@ -0,0 +1,242 @@
+#!/usr/bin/env python3
+"""
+Tests for the GCRA rate limiter in rate_limiter.py.
+Run with pytest. Time is driven by a fake clock, so nothing sleeps.
+"""
+
+import sys
+import os
+import asyncio
+import bisect
+import pytest
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+
+import rate_limiter
+from rate_limiter import MemoryStore, RedisStore, RateLimiter, HOUR_SECONDS, STATS_CACHE_TTL
+
+# ── Helpers ──────────────────────────────────────────────────────────────────
+
+class FakeClockStore(MemoryStore):
+    """MemoryStore whose clock only moves when a test moves it."""
+
+    def __init__(self, start=1000.0):
+        super().__init__()
+        self.clock = start
+
+    def now(self):
+        return self.clock
+
+def _limiter(hourly_limit=10, daily_limit=100, start=1000.0):
+    """A limiter on a fresh fake-clock store, plus the store to drive it."""
+    store = FakeClockStore(start)
+    return RateLimiter(hourly_limit, daily_limit, store=store), store
+
+def _drain(limiter):
+    """Acquire until refused; return how many operations got through."""
+    acquired = 0
+    while limiter.try_acquire()[0]:
+        acquired += 1
+    return acquired
+
+# ── Burst & Refill ───────────────────────────────────────────────────────────
+
+# Wall-clock sized starts too, since RedisStore runs on time.time()
+@pytest.mark.parametrize("start", [0.0, 1000.0, 1.7e9])
+@pytest.mark.parametrize("hourly_limit,daily_limit", [(10, 100), (100, 500), (1600, 11000), (7, 13)])
+def test_burst_capacity(hourly_limit, daily_limit, start):
+    """A frozen clock admits exactly the burst, and stats agree it's spent."""
+    limiter, _ = _limiter(hourly_limit, daily_limit, start)
+    burst = min(max(1, hourly_limit // 2), max(1, daily_limit // 2))
+
+    assert _drain(limiter) == burst
+    can_proceed, reason = limiter.can_proceed()
+    assert not can_proceed and "rate limit reached" in reason
+    assert f"burst of {burst} used" in reason
+    assert limiter.retry_after() > 0
+
+    stats = limiter.get_stats()
+    assert min(stats.hourly_remaining, stats.daily_remaining) == 0
+
+def test_refill_after_retry_after():
+    """Capacity returns exactly when retry_after() says it will."""
+    limiter, store = _limiter()
+    _drain(limiter)
+
+    wait = limiter.retry_after()
+    store.clock += wait - 1.0
+    assert not limiter.can_proceed()[0]
+
+    store.clock += 1.0
+    assert limiter.retry_after() == 0.0
+    assert limiter.try_acquire() == (True, "")
+    assert not limiter.can_proceed()[0]
+
+def test_sustained_rate_is_documented_split():
+    """After the burst, one operation gets through every period / (limit - burst + 1)."""
+    limiter, store = _limiter(hourly_limit=100, daily_limit=100000)
+    assert _drain(limiter) == 50
+    # 51 per hour sustained, i.e. one every 3600 / 51 seconds (less the slack)
+    assert limiter.retry_after() + rate_limiter.CLOCK_SLACK == pytest.approx(HOUR_SECONDS / 51)
+
+def test_rolling_hour_never_exceeds_limit():
+    """Greedy use, 1 s at a time, never fits more than the limit in an hour."""
+    limiter, store = _limiter(hourly_limit=100, daily_limit=10000)
+    times = []
+    for _ in range(int(3 * HOUR_SECONDS)):
+        while limiter.try_acquire()[0]:
+            times.append(store.clock)
+        store.clock += 1.0
+
+    worst = max(bisect.bisect_left(times, t + HOUR_SECONDS) - i for i, t in enumerate(times))
+    assert worst == 100
+
+@pytest.mark.parametrize("hourly_limit,daily_limit", [(0, 10), (10, 0), (-1, 10)])
+def test_limits_below_one_rejected(hourly_limit, daily_limit):
+    """A limit that could never admit an operation is refused up front."""
+    with pytest.raises(ValueError, match="limit must be at least 1"):
+        RateLimiter(hourly_limit, daily_limit)
+
+def test_limit_of_one():
+    """The smallest limit admits one operation per period."""
+    limiter, store = _limiter(hourly_limit=1, daily_limit=100)
+    assert _drain(limiter) == 1
+    store.clock += HOUR_SECONDS
+    assert _drain(limiter) == 1
+
+# ── Recording ────────────────────────────────────────────────────────────────
+
+def test_record_operations_matches_single_records():
+    """record_operations(n) leaves the same state as n record_operation() calls."""
+    bulk, _ = _limiter()
+    single, _ = _limiter()
+
+    bulk.record_operations(3)
+    for _ in range(3):
+        single.record_operation()
+
+    assert bulk.get_stats() == single.get_stats()
+    assert bulk.get_stats().hourly_count == 3
+    assert bulk.retry_after() == single.retry_after()
+
+def test_record_operations_ignores_non_positive():
+    """Recording zero operations changes nothing."""
+    limiter, _ = _limiter()
+    limiter.record_operations(0)
+    assert limiter.get_stats().hourly_count == 0
+
+def test_try_acquire_refusal_is_never_success():
+    """A refused advance reports failure even if a re-read shows room."""
+    class RefusingStore(FakeClockStore):
+        def advance(self, keys, increments, now, tolerances=None):
+            return False
+
+    limiter = RateLimiter(10, 100, store=RefusingStore())
+    acquired, reason = limiter.try_acquire()
+    assert not acquired
+    assert reason
+
+def test_stats_remaining_is_relative_to_burst():
+    """count + remaining == burst in every snapshot; the limit is reported alongside."""
+    limiter, store = _limiter(hourly_limit=100, daily_limit=500)
+    for _ in range(3):
+        _drain(limiter)
+        stats = limiter.get_stats()
+        assert (stats.hourly_limit, stats.hourly_burst) == (100, 50)
+        assert (stats.daily_limit, stats.daily_burst) == (500, 250)
+        assert stats.hourly_count + stats.hourly_remaining == stats.hourly_burst
+        assert stats.daily_count + stats.daily_remaining == stats.daily_burst
+        store.clock += HOUR_SECONDS / 2
+
+# ── Stats Cache ──────────────────────────────────────────────────────────────
+
+def test_stats_cached_within_ttl():
+    """Repeated get_stats() calls reuse the snapshot until the TTL runs out."""
+    limiter, store = _limiter()
+    first = limiter.get_stats()
+    assert limiter.get_stats() is first
+
+    store.clock += STATS_CACHE_TTL
+    assert limiter.get_stats() is not first
+
+def test_stats_cache_cleared_on_record():
+    """Recording an operation invalidates the cached snapshot straight away."""
+    limiter, _ = _limiter()
+    assert limiter.get_stats().hourly_count == 0
+
+    limiter.record_operation()
+    assert limiter.get_stats().hourly_count == 1
+
+    limiter.try_acquire()
+    assert limiter.get_stats().hourly_count == 2
+
+# ── Waiting ──────────────────────────────────────────────────────────────────
+
+def test_wait_if_needed_sleeps_for_retry_after(monkeypatch):
+    """wait_if_needed() sleeps once for retry_after() plus a 1 s buffer."""
+    limiter, _ = _limiter()
+    slept = []
+    monkeypatch.setattr(rate_limiter.time, 'sleep', slept.append)
+
+    assert limiter.wait_if_needed() is False
+    _drain(limiter)
+    wait = limiter.retry_after()
+    assert limiter.wait_if_needed() is True
+    assert slept == [wait + 1]
+
+def test_await_if_needed_sleeps_for_retry_after(monkeypatch):
+    """await_if_needed() waits on the event loop for the same delay."""
+    limiter, _ = _limiter()
+    slept = []
+
+    async def fake_sleep(seconds):
+        slept.append(seconds)
+
+    monkeypatch.setattr(rate_limiter.asyncio, 'sleep', fake_sleep)
+
+    assert asyncio.run(limiter.await_if_needed()) is False
+    _drain(limiter)
+    wait = limiter.retry_after()
+    assert asyncio.run(limiter.await_if_needed()) is True
+    assert slept == [wait + 1]
+
+# ── Redis Store ──────────────────────────────────────────────────────────────
+
+@pytest.fixture
+def redis_client():
+    """An in-process Redis with Lua scripting, skipped if fakeredis isn't installed."""
+    fakeredis = pytest.importorskip("fakeredis")
+    pytest.importorskip("lupa")
+    return fakeredis.FakeRedis()
+
+def test_redis_limiters_share_prefix(redis_client):
+    """Two limiters on the same prefix draw from one budget."""
+    first = RateLimiter(10, 100, store=RedisStore(redis_client, prefix='bot'))
+    second = RateLimiter(10, 100, store=RedisStore(redis_client, prefix='bot'))
+
+    # Take turns, so each limiter has to see the other's operations
+    acquired = [(first, second)[i % 2].try_acquire()[0] for i in range(6)]
+    assert acquired == [True] * 5 + [False]
+    assert not first.can_proceed()[0]
+    assert not second.can_proceed()[0]
+    assert first.get_stats().hourly_count == second.get_stats().hourly_count == 5
+
+def test_redis_prefixes_are_independent(redis_client):
+    """A different prefix keeps its own budget."""
+    full = RateLimiter(10, 100, store=RedisStore(redis_client, prefix='bot-a'))
+    other = RateLimiter(10, 100, store=RedisStore(redis_client, prefix='bot-b'))
+
+    _drain(full)
+    assert other.try_acquire() == (True, "")
+
+def test_redis_record_operations(redis_client):
+    """record_operations(n) through Redis fills the burst exactly."""
+    limiter = RateLimiter(10, 100, store=RedisStore(redis_client, prefix='bot'))
+    limiter.record_operations(5)
+    assert not limiter.can_proceed()[0]
+    assert limiter.get_stats().hourly_remaining == 0
+
+def test_redis_full_burst(redis_client):
+    """A large burst through Redis is admitted exactly, despite Unix-time floats."""
+    limiter = RateLimiter(1600, 11000, store=RedisStore(redis_client, prefix='bot'))
+    assert _drain(limiter) == 800
+    assert limiter.get_stats().hourly_remaining == 0